@@ -17,65 +17,257 @@ Floyd's (Floyd-Warshall) All Pairs Shortest Path
            indexed from 0 to n - 1, where P[i][j] is the highest index of an
            intermediate vertex on the shortest path from the ith vertex to the
            jth vertex if at least one intermediate vertex exists otherwise
-           infinity.
+           -1.
 '''
 
 
+from collections.abc import Callable
+import functools
 import itertools
-from copy import deepcopy
 from math import inf
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional - fall back to NumPy broadcasting
+    njit = None
+
 
 INF = '\u221e'  # Infinity symbol
 
 
 type Number = int | float  # Can't constraint to just int and inf, next best
+type Matrix = list[list[Number]] | np.ndarray
+
+
+# Largest fraction of the matrix worth updating as a gathered sub-block rather
+# than in-place as a whole (NumPy path)
+SUBBLOCK_MAX = 1 / 4
+
+# Largest graph to generate an unrolled kernel for (see _compile_floyd)
+UNROLL_MAX = 16
 
 
-def allpairsp(W: list[list[Number]], n: int=0) -> tuple[list[list[Number]], list[list[Number]]]:
+def _as_weights(W: Matrix, n: int) -> tuple[np.ndarray, Number]:
+    '''
+    Copy the first n x n of W into an ndarray returning it along with the value
+    representing no edge
+
+    Nonnegative integer weights are stored as integers with a sentinel of
+    (max weight * n + 1) for no edge - larger than any path can be, so the hot
+    loop is plain integer add/compare with no inf handling.  int32 (half the
+    bytes of float64) is used if sentinel + sentinel fits, otherwise int64.
+    Other weights are stored as float64 with inf.
+    '''
+    W = np.asarray(W, dtype=np.float64)[:n, :n]
+    edges = np.isfinite(W)
+    weights = W[edges]
+    if np.array_equal(weights, np.trunc(weights)) and not (weights < 0).any():
+        sentinel = int(weights.max(initial=0)) * n + 1
+        for dtype in (np.int32, np.int64):
+            if 2 * sentinel <= np.iinfo(dtype).max:
+                return np.where(edges, W, sentinel).astype(dtype), sentinel
+
+    return W.copy(), inf
+
+
+if njit is not None:
+    # fastmath is deliberately left off - it assumes no infinities, and inf still
+    # represents missing edges for non-integer weights
+    @njit(parallel=True, cache=True)
+    def _floyd(D: np.ndarray, P: np.ndarray, n: int, no_edge: Number) -> None:
+        '''
+        Floyd-Warshall kernel updating D and P in-place
+
+        Row k and column k are invariant during iteration k, so the rows can be
+        relaxed in parallel.  D[i, k] is hoisted so the inner loop is a
+        contiguous add/compare over row k which LLVM can vectorize.  Rows which
+        can't reach k are skipped (if rather than continue to keep the prange
+        body single entry/exit).
+        '''
+        for k in range(n):
+            for i in prange(n):
+                dik = D[i, k]
+                if dik < no_edge:
+                    for j in range(n):
+                        s = dik + D[k, j]
+                        if s < D[i, j]:
+                            D[i, j] = s
+                            P[i, j] = k
+
+
+@functools.lru_cache
+def _compile_floyd(n: int) -> Callable[[list[list[Number]], list[list[int]], Number], None]:
+    '''
+    Generate a Floyd-Warshall kernel specialized for n vertices
+
+    Loop bounds are constants and the j loop is fully unrolled so each row
+    relaxation is straight-line code.  Works on lists as indexing an ndarray
+    element by element from Python is slower than indexing a list.
+    '''
+    lines = [
+        'def floyd(D, P, no_edge):',
+        f'    for k in range({n}):',
+        '        Dk = D[k]',
+        f'        for i in range({n}):',
+        '            Di = D[i]',
+        '            dik = Di[k]',
+        '            if dik < no_edge:',
+        '                Pi = P[i]',
+    ]
+    for j in range(n):
+        lines += [
+            f'                s = dik + Dk[{j}]',
+            f'                if s < Di[{j}]:',
+            f'                    Di[{j}] = s',
+            f'                    Pi[{j}] = k',
+        ]
+
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['floyd']
+
+
+def allpairsp(W: Matrix, n: int=0, *, pure_python: bool=False) -> tuple[Matrix, Matrix]:
     '''
     Floyd-Warshall All Pairs Shortest Path Algorithm
 
     Parameters:
     n = number of vertices (Default to len(W) but may want to limit to first n vertices)
     W = adjacency matrix representing weighted graph
+    pure_python = use the textbook triple loop instead of Numba/NumPy
 
-    Returns:
-    D = distance/minimum weight/cost matrix between all pairs of vertices
-    P = path reconstruction matrix
+    Returns (n x n list of lists if pure_python otherwise ndarrays):
+    D = distance/minimum weight/cost matrix between all pairs of vertices (float64)
+    P = path reconstruction matrix (int64)
     '''
     if not n:
         n = len(W)
-    D = deepcopy(W)
-    P = [[inf for _ in range(n)] for _ in range(n)]
 
-    # All pairs shortest path with path reconstruction
-    # Instead of for k in range(n): for i in range(n): for j in range(n): ...:
-    for k, i, j in itertools.product(range(n), range(n), range(n)):
-        if D[i][k] + D[k][j] < D[i][j]:
-            P[i][j] = k
-            D[i][j] = D[i][k] + D[k][j]
+    if pure_python:
+        # Weights are immutable scalars so copying each row is enough - no need
+        # for deepcopy's memo and recursion (list() also copies ndarray rows)
+        D = [list(row[:n]) for row in W[:n]]
+        P = [[-1 for _ in range(n)] for _ in range(n)]
+
+        # All pairs shortest path with path reconstruction
+        # Instead of for k in range(n): for i in range(n): for j in range(n): ...:
+        for k, i in itertools.product(range(n), range(n)):
+            Di, Dk = D[i], D[k]
+            dik = Di[k]
+            # No path from i through k - nothing in row i can improve
+            if dik == inf:
+                continue
+            for j in range(n):
+                s = dik + Dk[j]
+                if s < Di[j]:
+                    P[i][j] = k
+                    Di[j] = s
+
+        return D, P
+
+    if njit is None and n <= UNROLL_MAX:
+        # Run on row copies of W directly - at this size converting to and from
+        # ndarrays costs more than the unrolled kernel saves
+        D = [list(row[:n]) for row in W[:n]]
+        P = [[-1] * n for _ in range(n)]
+        _compile_floyd(n)(D, P, inf)
+        return np.array(D, dtype=np.float64), np.array(P, dtype=np.int64)
+
+    D, no_edge = _as_weights(W, n)
+    P = np.full((n, n), -1, dtype=np.int64)
+
+    if njit is not None:
+        _floyd(D, P, n, D.dtype.type(no_edge))
+    else:
+        # Row k and column k don't change during iteration k (D[k][k] == 0), so
+        # the i/j double loop collapses into one outer sum broadcast over the matrix.
+        # The sum and mask are written into buffers reused for every k rather
+        # than allocating new n x n temporaries each iteration:
+        newD = np.empty_like(D)
+        mask = np.empty((n, n), dtype=np.bool_)
+        for k in range(n):
+            # Only vertices which reach k (rows) and are reached from k (cols) can
+            # improve.  Gathering/scattering that sub-block costs far more per
+            # element than the in-place update, so only do it when the sub-block
+            # is a small fraction of the matrix (see SUBBLOCK_MAX)
+            rows = np.flatnonzero(D[:, k] < no_edge)
+            cols = np.flatnonzero(D[k] < no_edge)
+            if not rows.size or not cols.size:
+                continue
+            if rows.size * cols.size >= SUBBLOCK_MAX * n * n:
+                np.add(D[:, k, None], D[None, k, :], out=newD)
+                np.less(newD, D, out=mask)
+                np.copyto(P, k, where=mask)
+                np.minimum(D, newD, out=D)
+                continue
+
+            block = np.ix_(rows, cols)
+            block_newD = newD[:rows.size, :cols.size]
+            block_mask = mask[:rows.size, :cols.size]
+            block_D, block_P = D[block], P[block]
+            np.add(D[rows, k, None], D[None, k, cols], out=block_newD)
+            np.less(block_newD, block_D, out=block_mask)
+            np.copyto(block_P, k, where=block_mask)
+            np.minimum(block_D, block_newD, out=block_D)
+            D[block], P[block] = block_D, block_P
+
+    if no_edge is not inf:
+        # Distances never exceed the sentinel - map unreachable back to inf
+        D = np.where(D >= no_edge, inf, D)
 
     return D, P
 
 
-def get_int_path(P: list[list[Number]], i: int, j: int) -> None:
-    if P[i][j] != inf:
-        get_int_path(P, i, int(P[i][j]))
-        print(f'v{P[i][j] + 1} -> ', end='')
-        get_int_path(P, int(P[i][j]), j)
+def get_int_path(P: Matrix, i: int, j: int) -> list[int]:
+    '''
+    Return the intermediate vertices on the shortest path from vertex i to j
+
+    Walks the (i, k) and (k, j) halves with an explicit stack rather than
+    recursion - (k, j) is pushed first so (i, k) is walked first.  Each segment
+    without an intermediate vertex starts at the next vertex on the path, apart
+    from the first segment which starts at i.
+
+    Every pending segment adds at least one more vertex and a shortest path
+    visits at most n vertices, so once that's exceeded P must contain a cycle
+    (from a negative cycle in the graph) and the walk would never end.
+    '''
+    n = len(P)
+    path = []
+    stack = [(i, j)]
+    while stack:
+        if len(path) + len(stack) > n:
+            raise ValueError('negative cycle - no shortest path from '
+                             f'v{i + 1} to v{j + 1}')
+        a, b = stack.pop()
+        k = P[a][b]
+        if k < 0:
+            path.append(a)
+            continue
+        stack.append((k, b))
+        stack.append((a, k))
+
+    return path[1:]
+
+
+def format_path(P: Matrix, i: int, j: int) -> str:
+    # Output:  'v1 -> v4 -> v5'
+    path = [i, *get_int_path(P, i, j), j]
+    return 'v' + ' -> v'.join(str(v + 1) for v in path)
+
 
+def print_path(P: Matrix, i: int, j: int, *, inline: bool=False) -> None:
+    print(format_path(P, i, j), end='' if inline else '\n')
 
-def print_path(P: list[list[Number]], i: int, j: int, *, inline: bool=False) -> None:
-    print(f'v{i + 1} -> ', end='')
-    get_int_path(P, i, j)
-    print(f'v{j + 1}', end='')
 
-    if not inline:
-        print()
+def as_display(w: Number) -> Number:
+    # Distances come back as floats from the ndarray paths - show whole numbers
+    # as ints (1234567 rather than 1234567.0 or 1.23457e+06)
+    return int(w) if w != inf and w == int(w) else w
 
 
-def print_weighted_graph(W: list[list[Number]], *, as_vertex: bool=False) -> None:
+def print_weighted_graph(W: Matrix, *, as_vertex: bool=False) -> None:
     n = len(W)
     offset = 1 if as_vertex else 0
 
@@ -83,12 +275,15 @@ def print_weighted_graph(W: list[list[Number]], *, as_vertex: bool=False) -> Non
     # 'v ---1---2---3---4---5'
     # '1| inf   1'
     # '...'
-    print('v ' + ''.join(f'{v:_>3}' for v in range(1, n + 1)))
-    for v, row in enumerate(W):
-        print(f'{v + 1}|' + ''.join(f'{w + offset: >3}' if w != inf else f'{0: >3}' for w in row))
+    cells = [[str(as_display(w + offset)) if w != inf else '0' for w in row] for row in W]
+    # Widen columns past 3 if needed so large weights don't run together
+    width = max(3, len(str(n)) + 1, *(len(cell) + 1 for row in cells for cell in row))
+    print('v ' + ''.join(f'{v:_>{width}}' for v in range(1, n + 1)))
+    for v, row in enumerate(cells):
+        print(f'{v + 1}|' + ''.join(f'{cell: >{width}}' for cell in row))
 
 
-def print_results(W: list[list[Number]], n: int=0) -> None:
+def print_results(W: Matrix, n: int=0) -> None:
     if not n:
         n = len(W)
     D, P = allpairsp(W)
@@ -103,8 +298,7 @@ def print_results(W: list[list[Number]], n: int=0) -> None:
     for i, j in itertools.product(range(n), range(n)):
         if i == j:
             continue
-        print(f'From v{i + 1} to v{j + 1} (Weight: {D[i][j]: >2}):  ', end='')
-        print_path(P, i, j)
+        print(f'From v{i + 1} to v{j + 1} (Weight: {as_display(D[i][j]): >2}):  {format_path(P, i, j)}')
 
 
 if __name__ == '__main__':
@@ -10,17 +10,26 @@ Binary Search
 '''
 
 
-from bisect import insort
+from bisect import bisect_left
 from collections.abc import Sequence
-import random
 import time
 from typing import Any
 
+import numpy as np
+
 
 def binsearch(sequence: Sequence[Any], target: Any, *, verbose: bool=False) -> int:
     '''
     Perform binary search on sequence for target returning index or -1
+
+    Uses bisect_left unless verbose, in which case each step of the hand-written
+    search is traced
     '''
+    if not verbose:
+        # Same algorithm implemented in C - no per step interpreter overhead
+        index = bisect_left(sequence, target)
+        return index if index < len(sequence) and sequence[index] == target else -1
+
     low = 0
     high = len(sequence) - 1
 
@@ -44,31 +53,56 @@ def binsearch(sequence: Sequence[Any], target: Any, *, verbose: bool=False) -> i
     return -1
 
 
+def binsearch_many(sequence: Sequence[Any], targets: Sequence[Any]) -> np.ndarray:
+    '''
+    Binary search sequence for every target at once returning array of indexes
+    (-1 for each target not present)
+    '''
+    arr = np.asarray(sequence)
+    tgts = np.asarray(targets)
+    if not arr.size:
+        return np.full(tgts.shape, -1, dtype=np.intp)
+
+    idx = np.searchsorted(arr, tgts)
+    found = (idx < len(arr)) & (arr[np.clip(idx, 0, len(arr) - 1)] == tgts)
+    return np.where(found, idx, -1)
+
+
 if __name__ == '__main__':
     start1 = time.perf_counter()
-    rng = random.SystemRandom()
+    rng = np.random.default_rng()
     seqlen = 1_000_000
     '''
     # Too slow - takes almost a minute!!!
+    from bisect import insort
     numseq = []
     for _ in range(seqlen):
-        num = rng.randint(1, 2_000_000)
+        num = int(rng.integers(1, 2_000_000, endpoint=True))
         insort(numseq, num)
     '''
-    numseq = rng.sample(range(1, 2_000_000), seqlen)
-    numseq.sort()
+    # Sample 1 to 1,999,999 without replacement - generated and sorted in C as a
+    # contiguous int64 array rather than a list of Python ints
+    numarr = rng.choice(1_999_999, size=seqlen, replace=False) + 1
+    numarr.sort()
 
-    seqset = set(numseq)  # Validation
-    targets = rng.sample(range(1, 2_000_000), 20)
+    seqset = set(numarr.tolist())  # Validation
+    targets = (rng.choice(1_999_999, size=20, replace=False) + 1).tolist()
 
     start2 = time.perf_counter()
-    for target in targets:
+    # All searches in one vectorized call rather than one binsearch per target
+    indexes = binsearch_many(numarr, targets)
+    start3 = time.perf_counter()
+    # One binsearch per target for comparison
+    single_indexes = [binsearch(numarr, target) for target in targets]
+    end = time.perf_counter()
+
+    for target, index, single_index in zip(targets, indexes, single_indexes):
         print(
             f'Searching for {target:9,} in {seqlen:,} item sequence => '
-            f'{binsearch(numseq, target, verbose=False):9,} (Present={target in numseq})'
+            f'{index:9,} (Present={target in seqset}, binsearch agrees={index == single_index})'
         )
-    end = time.perf_counter()
 
     print(f'\n        Binary search setup time: {(start2 - start1):.6f}')
-    print(f'Average time/function invocation: {(end - start2)/len(targets):.6f}')
+    print(f'    Batched search time / target: {(start3 - start2)/len(targets):.6f}')
+    print(f'Average time/function invocation: {(end - start3)/len(targets):.6f}')
     print(f'                   Total runtime: {(end - start1):.6f}\n')
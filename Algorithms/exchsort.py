@@ -3,10 +3,17 @@
 Foundations of Algorithms
 Chapter 1 - Algorithms - Efficiency, Analysis, and Order
 
-Exchange Sort
+Exchange Sort (implemented as Selection Sort)
 * Problem:  Sort sequence in non-decreasing order
 * Inputs:  sequence
 * Outputs:  sequence sorted (in-place)
+
+Note:  Exchange sort swaps S[i] and S[j] whenever S[j] < S[i] while comparing
+       S[i] against each later item.  This file implements selection sort
+       instead - each pass compares the same pairs (n(n-1)/2 comparisons) but
+       only tracks the index of the smallest remaining item, then does at most
+       one swap to put it at S[i].  That is at most n - 1 swaps rather than up
+       to n(n-1)/2.
 '''
 
 
@@ -15,26 +22,61 @@ import random
 from typing import Any
 
 
-def exchsort(sequence: MutableSequence[Any], *, verbose: bool=False) -> None:
+def exchsort(sequence: MutableSequence[Any], *, verbose: bool=False, fast: bool=False) -> None:
     '''
-    Iterate through sequence, swapping items not in non-decreasing order
+    Iterate through sequence, moving the smallest remaining item into place
+
+    Each pass tracks the index of the smallest remaining item and does at most
+    one swap, rather than swapping every out of order pair it compares.
+
+    fast = skip the algorithm and use the built-in sort (Timsort)
     '''
-    for outer_index in range(len(sequence)):
-        for inner_index in range(outer_index + 1, len(sequence)):
-            if verbose:
-                print(
-                    f'Comparing sequence index {outer_index} ({sequence[outer_index]}) '
-                    f'with {inner_index} ({sequence[inner_index]})'
-                )
-            if sequence[outer_index] > sequence[inner_index]:
-                sequence[outer_index], sequence[inner_index] = (
-                    sequence[inner_index], sequence[outer_index]
-                )
-                if verbose:
-                    print(
-                        f'Updated sequence:  {", ".join(map(str, sequence))}'
-                        f' (swapped {sequence[outer_index]} and {sequence[inner_index]})'
-                    )
+    if fast:
+        if isinstance(sequence, list):
+            sequence.sort()
+        else:
+            for index, item in enumerate(sorted(sequence)):
+                sequence[index] = item
+    elif verbose:
+        _exchsort_verbose(sequence)
+    else:
+        # Separate function so the hot loop doesn't check verbose every comparison
+        _exchsort_quiet(sequence)
+
+
+def _exchsort_quiet(sequence: MutableSequence[Any]) -> None:
+    seqlen = len(sequence)
+    for outer_index in range(seqlen):
+        min_index = outer_index
+        min_item = sequence[outer_index]
+        for inner_index in range(outer_index + 1, seqlen):
+            if min_item > sequence[inner_index]:
+                min_index = inner_index
+                min_item = sequence[inner_index]
+        if min_index != outer_index:
+            sequence[min_index] = sequence[outer_index]
+            sequence[outer_index] = min_item
+
+
+def _exchsort_verbose(sequence: MutableSequence[Any]) -> None:
+    seqlen = len(sequence)
+    for outer_index in range(seqlen):
+        min_index = outer_index
+        for inner_index in range(outer_index + 1, seqlen):
+            print(
+                f'Comparing sequence index {min_index} ({sequence[min_index]}) '
+                f'with {inner_index} ({sequence[inner_index]})'
+            )
+            if sequence[min_index] > sequence[inner_index]:
+                min_index = inner_index
+        if min_index != outer_index:
+            outer_item, min_item = sequence[outer_index], sequence[min_index]
+            sequence[outer_index], sequence[min_index] = min_item, outer_item
+            # Only the swapped pair - printing the whole sequence is O(n) per swap
+            print(
+                f'Swapped index {outer_index} ({outer_item}) '
+                f'with {min_index} ({min_item})'
+            )
 
 
 if __name__ == '__main__':
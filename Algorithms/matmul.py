@@ -13,27 +13,50 @@ Matrix Multiplication
 from collections.abc import Sequence
 from itertools import product
 
+import numpy as np
+
 
 type Number = int | float
 
+INT64_MAX = np.iinfo(np.int64).max
+
 
 class Matrix:
-    def __init__(self, matrix: Sequence[Sequence[Number]]|None=None, *, n: int|None=None) -> None:
-        if matrix and len(matrix) != len(matrix[0]):
-            raise ValueError('Matrix must be n x n (same number of rows and columns)')
-        elif matrix is None and n is None:
+    def __init__(self, matrix: Sequence[Sequence[Number]]|np.ndarray|None=None, *,
+                 n: int|None=None) -> None:
+        if matrix is None and n is None:
             raise ValueError('Must either pass in matrix or specify n to initialize matrix')
         elif matrix is None:
-            self.matrix = [[0] * n for _ in range(n)]
+            self.matrix = np.zeros((n, n), dtype=np.int64)
             self.n = n
-        elif matrix and n:
+        elif n:
             raise ValueError('Can pass in matrix and specify n to initialize matrix')
+        elif not len(matrix):
+            self.matrix = np.zeros((0, 0), dtype=np.int64)
+            self.n = 0
         else:
-            self.matrix = matrix
-            self.n = len(matrix)
+            array = np.asarray(matrix)
+            if array.ndim != 2 or array.shape[0] != array.shape[1]:
+                raise ValueError('Matrix must be n x n (same number of rows and columns)')
+            # Contiguous row-major buffer - int64 if all elements are integers
+            # which fit, object (exact Python ints) for larger integers, otherwise
+            # float64
+            if np.issubdtype(array.dtype, np.integer):
+                dtype = object if array.max() > INT64_MAX else np.int64
+            elif array.dtype.kind in 'fO' and all(
+                isinstance(item, int) for row in matrix for item in row
+            ):
+                # NumPy infers float64 (lossy) or object for ints outside int64 -
+                # rebuild from the original Python ints to keep them exact
+                dtype = object
+                array = np.array(matrix, dtype=object)
+            else:
+                dtype = np.float64
+            self.matrix = np.ascontiguousarray(array, dtype=dtype)
+            self.n = len(self.matrix)
 
     def __repr__(self) -> str:
-        return f'Matrix({self.matrix})'
+        return f'Matrix({self.matrix.tolist()})'
 
     def __str__(self) -> str:
         # Determine the width of the widest element in the matrix for alignment
@@ -41,9 +64,16 @@ class Matrix:
         output = [' '.join(f'{str(item):>{col_width}}' for item in row) for row in self.matrix]
         return '\n'.join(output)
 
-    def __getitem__(self, index: int) -> Sequence[Number]:
+    def __getitem__(self, index: int) -> np.ndarray:
         return self.matrix[index]
 
+    def __array__(self, dtype: np.dtype|None=None, copy: bool|None=None) -> np.ndarray:
+        if dtype is None or dtype == self.matrix.dtype:
+            return self.matrix.copy() if copy else self.matrix
+        if copy is False:
+            raise ValueError(f'Unable to convert Matrix to {dtype} without a copy')
+        return self.matrix.astype(dtype)
+
     def __len__(self) -> int:
         return self.n
 
@@ -53,21 +83,32 @@ class Matrix:
         if len(self) != len(other):
             raise ValueError('Both matrices must be n x n (same number of rows and columns)')
 
-        n = len(self)
-        result = Matrix(n=n)
-        for row_index, col_index, inner_index in product(range(n), range(n), range(n)):
-            result[row_index][col_index] += (
-                self[row_index][inner_index] * other[inner_index][col_index]
-            )
+        # Delegate to NumPy - see matmul(..., pure_python=True) for the loops
+        return matmul(self, other)
 
-        return result
+
+def product_dtype(a: Matrix, b: Matrix) -> np.dtype:
+    '''
+    Return the dtype for the product of a and b
+
+    NumPy int64 arithmetic wraps silently on overflow, so integer products which
+    could exceed int64 (n * max|a| * max|b|) use object (exact Python ints)
+    '''
+    dtype = np.result_type(a.matrix, b.matrix)
+    if dtype == np.int64:
+        a_max, b_max = (
+            max(abs(int(m.matrix.min(initial=0))), abs(int(m.matrix.max(initial=0))))
+            for m in (a, b)
+        )
+        if len(a) * a_max * b_max > INT64_MAX:
+            return np.dtype(object)
+    return dtype
 
 
 def print_matrix_equation(a: Matrix, b: Matrix, c: Matrix) -> None:
     n = len(a)
     # Determine the width of the widest number across all three matrices
-    all_vals = a.matrix + b.matrix + c.matrix
-    col_width = max(len(str(item)) for row in all_vals for item in row)
+    col_width = max(len(str(item)) for m in (a, b, c) for row in m.matrix for item in row)
 
     for i in range(n):
         a_row = ' '.join(f'{item:>{col_width}}' for item in a[i])
@@ -81,25 +122,63 @@ def print_matrix_equation(a: Matrix, b: Matrix, c: Matrix) -> None:
         print(f'{a_row} {x_sym} {b_row} {eq_sym} {c_row}')
 
 
-def matmul(a: Matrix, b: Matrix) -> Matrix:
+def matmul(a: Matrix, b: Matrix, *, pure_python: bool=False, block: int=0) -> Matrix:
+    '''
+    Multiply n x n matrices a and b returning the product as a new Matrix
+
+    By default this uses NumPy - BLAS GEMM for float64, NumPy's own loops for
+    integers (which don't use BLAS); pure_python=True uses the textbook triple
+    loop instead.  block > 0 multiplies block x block tiles with NumPy for when
+    NumPy isn't backed by an optimized BLAS (64 makes each float64 tile 32KB, so
+    the a, b and c tiles together - 96KB - stay in L2 cache).
+
+    All paths return the same dtype (see product_dtype) - integer products
+    which could overflow int64 are computed exactly as Python ints.
+    '''
     if len(a) != len(b):
         raise ValueError('Both matrices must be n x n (same number of rows and columns)')
+    if block < 0:
+        raise ValueError('Block size must be positive (or 0 to not use blocks)')
+    if block and pure_python:
+        raise ValueError('Can pass in block or specify pure_python but not both')
 
     n = len(a)
-    c = Matrix(n=n)
-    # Note:  See use of itertools.product in Matrix.__mul__
+    dtype = product_dtype(a, b)
+    if block:
+        A, B = a.matrix.astype(dtype, copy=False), b.matrix.astype(dtype, copy=False)
+        C = np.zeros((n, n), dtype=dtype)
+        for ii, kk, jj in product(range(0, n, block), repeat=3):
+            C[ii:ii + block, jj:jj + block] += (
+                A[ii:ii + block, kk:kk + block] @ B[kk:kk + block, jj:jj + block]
+            )
+        return Matrix(C)
+
+    if not pure_python:
+        return Matrix(np.matmul(a.matrix.astype(dtype, copy=False),
+                                b.matrix.astype(dtype, copy=False)))
+
     '''
-    Refactor this to below:
-    for row_index in range(len(a)):
-        for col_index in range(len(b)):
-            for inner_index in range(len(c)):
+    Textbook (i-j-k) order walks down a column of b in the inner loop:
+    for row_index in range(n):
+        for col_index in range(n):
+            for inner_index in range(n):
                 c[row_index][col_index] += a[row_index][inner_index] * b[inner_index][col_index]
-    '''
-    for row_index, col_index in product(range(len(a)), range(len(b))):
-        for inner_index in range(len(c)):
-            c[row_index][col_index] += a[row_index][inner_index] * b[inner_index][col_index]
 
-    return c
+    Use i-k-j order instead - hoist a[i][k] and stream along row b[k] so the inner
+    loop is a row update (c[i] += a[i][k] * b[k]) over contiguous memory.
+    Loop over plain lists of Python numbers rather than going through
+    Matrix.__getitem__ and ndarray element access for every item:
+    '''
+    A, B = a.matrix.tolist(), b.matrix.tolist()
+    C = [[0] * n for _ in range(n)]
+    for row_index, A_row in enumerate(A):
+        C_row = C[row_index]
+        for inner_index, a_item in enumerate(A_row):
+            B_row = B[inner_index]
+            for col_index in range(n):
+                C_row[col_index] += a_item * B_row[col_index]
+
+    return Matrix(np.array(C, dtype=dtype))
 
 
 if __name__ == '__main__':
@@ -11,10 +11,11 @@ Sequential Search
 
 
 from collections.abc import Sequence
-import random
 import time
 from typing import Any
 
+import numpy as np
+
 
 def seqsearch(sequence: Sequence[Any], target: Any) -> int:
     '''
@@ -26,6 +27,11 @@ def seqsearch(sequence: Sequence[Any], target: Any) -> int:
             return index
     return -1
     '''
+    # Vectorized - compare every element in C then take the first hit:
+    if isinstance(sequence, np.ndarray):
+        hits = np.flatnonzero(sequence == target)
+        return int(hits[0]) if hits.size else -1
+
     # Optimized - return index if found else -1:
     # next returns first matching item from generator expression - if no matches
     # then returns -1
@@ -36,11 +42,13 @@ def seqsearch(sequence: Sequence[Any], target: Any) -> int:
 
 if __name__ == '__main__':
     start1 = time.perf_counter()
-    rng = random.SystemRandom()
+    rng = np.random.default_rng()
     seqlen = 1_000_000
-    sequence = rng.sample(range(1, 2_000_000), seqlen)
-    targets = rng.sample(range(1, 2_000_000), 20)
-    seqset = set(sequence)  # Validation
+    # Sample 1 to 1,999,999 without replacement - generated in C as a contiguous
+    # int64 array rather than a list of Python ints
+    sequence = rng.choice(1_999_999, size=seqlen, replace=False) + 1
+    targets = (rng.choice(1_999_999, size=20, replace=False) + 1).tolist()
+    seqset = set(sequence.tolist())  # Validation
 
     start2 = time.perf_counter()
     for target in targets: